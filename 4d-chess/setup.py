@@ -7,7 +7,7 @@ setup(
     author="Codex",
     packages=find_packages(where="src"),
     package_dir={"": "src"},
-    python_requires=">=3.8",
+    python_requires=">=3.10",
     entry_points={
         "console_scripts": [
             "4d-chess=cli.main:main",
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import argparse
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 from game.engine import GameEngine
 from game.rules import Move, coordinate_to_string
@@ -23,6 +23,104 @@ def describe_moves(moves: List[Move]) -> List[str]:
     return descriptions
 
 
+def cmd_help(engine: GameEngine, rest: str) -> None:
+    print("Commands: board, moves <coord>, move <start> <end>, layout <op> <params>, save <path>, load <path>, winner, quit")
+
+
+def cmd_quit(engine: GameEngine, rest: str) -> bool:
+    print("Goodbye!")
+    return True
+
+
+def cmd_board(engine: GameEngine, rest: str) -> None:
+    for entry in engine.board_snapshot():
+        print(entry)
+
+
+def cmd_moves(engine: GameEngine, rest: str) -> None:
+    try:
+        coord = parse_coordinate(rest)
+        moves = engine.legal_ordinary_moves_from(coord)
+        if not moves:
+            print("No legal moves for that square.")
+        else:
+            for line in describe_moves(moves):
+                print(line)
+    except ValueError as exc:
+        print(exc)
+
+
+def cmd_move(engine: GameEngine, rest: str) -> None:
+    try:
+        start_text, end_text = rest.split(maxsplit=1)
+        start = parse_coordinate(start_text)
+        end = parse_coordinate(end_text)
+        result = engine.execute_move(engine.current_player_id, start, end)
+        print(result)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+
+
+def cmd_layout(engine: GameEngine, rest: str) -> None:
+    parts = rest.split()
+    if not parts:
+        print("Usage: layout <operation> ...")
+        return
+    operation = parts[0]
+    try:
+        metadata = parse_layout(operation, parts[1:])
+        metadata["operation"] = operation
+        message = engine.perform_layout(engine.current_player_id, metadata)
+        print(message)
+    except ValueError as exc:
+        print(f"Error: {exc}")
+
+
+def cmd_save(engine: GameEngine, rest: str) -> None:
+    if not rest:
+        print("Usage: save <path>")
+        return
+    engine.save(rest)
+    print(f"Game saved to {rest}")
+
+
+def cmd_load(engine: GameEngine, rest: str) -> None:
+    if not rest:
+        print("Usage: load <path>")
+        return
+    try:
+        engine.replace_state(GameEngine.load(rest))
+        print(f"Loaded game from {rest}")
+    except ValueError as exc:
+        print(exc)
+
+
+def cmd_winner(engine: GameEngine, rest: str) -> None:
+    winner = engine.winner()
+    if winner is None:
+        print("No winner yet.")
+    else:
+        print(f"Winner: {engine.players[winner].name}")
+
+
+def cmd_unknown(engine: GameEngine, rest: str) -> None:
+    print("Unknown command. Type 'help' for assistance.")
+
+
+DISPATCH: Dict[str, Callable[[GameEngine, str], Optional[bool]]] = {
+    "help": cmd_help,
+    "quit": cmd_quit,
+    "exit": cmd_quit,
+    "board": cmd_board,
+    "moves": cmd_moves,
+    "move": cmd_move,
+    "layout": cmd_layout,
+    "save": cmd_save,
+    "load": cmd_load,
+    "winner": cmd_winner,
+}
+
+
 def repl(engine: GameEngine) -> None:
     print("Welcome to 4D Chess! Type 'help' for commands.")
     while True:
@@ -30,83 +128,10 @@ def repl(engine: GameEngine) -> None:
         command = input(f"[{engine.players[player].name}] > ").strip()
         if not command:
             continue
-        if command in {"quit", "exit"}:
-            print("Goodbye!")
+        verb, _, rest = command.partition(" ")
+        # Handlers return True to end the session
+        if DISPATCH.get(verb, cmd_unknown)(engine, rest.strip()):
             break
-        if command == "help":
-            print("Commands: board, moves <coord>, move <start> <end>, layout <op> <params>, save <path>, load <path>, winner, quit")
-            continue
-        if command == "board":
-            for entry in engine.board_snapshot():
-                print(entry)
-            continue
-        if command.startswith("moves"):
-            try:
-                _, coord_text = command.split(maxsplit=1)
-                coord = parse_coordinate(coord_text)
-                moves = engine.legal_moves_from(coord)
-                if not moves:
-                    print("No legal moves for that square.")
-                else:
-                    for line in describe_moves(moves):
-                        print(line)
-            except ValueError as exc:
-                print(exc)
-            continue
-        if command.startswith("move"):
-            try:
-                _, start_text, end_text = command.split(maxsplit=2)
-                start = parse_coordinate(start_text)
-                end = parse_coordinate(end_text)
-                result = engine.execute_move(player, start, end)
-                print(result)
-            except ValueError as exc:
-                print(f"Error: {exc}")
-            continue
-        if command.startswith("layout"):
-            parts = command.split()
-            if len(parts) < 2:
-                print("Usage: layout <operation> ...")
-                continue
-            operation = parts[1]
-            try:
-                metadata = parse_layout(operation, parts[2:])
-                metadata["operation"] = operation
-                message = engine.perform_layout(player, metadata)
-                print(message)
-            except ValueError as exc:
-                print(f"Error: {exc}")
-            continue
-        if command.startswith("save"):
-            try:
-                _, path = command.split(maxsplit=1)
-                engine.save(path)
-                print(f"Game saved to {path}")
-            except ValueError as exc:
-                print(exc)
-            continue
-        if command.startswith("load"):
-            try:
-                _, path = command.split(maxsplit=1)
-                new_engine = GameEngine.load(path)
-                engine.board = new_engine.board
-                engine.players = new_engine.players
-                engine.turn_index = new_engine.turn_index
-                engine.active_players = new_engine.active_players
-                engine.pawn_profiles = new_engine.pawn_profiles
-                engine.rules = new_engine.rules
-                print(f"Loaded game from {path}")
-            except ValueError as exc:
-                print(exc)
-            continue
-        if command == "winner":
-            winner = engine.winner()
-            if winner is None:
-                print("No winner yet.")
-            else:
-                print(f"Winner: {engine.players[winner].name}")
-            continue
-        print("Unknown command. Type 'help' for assistance.")
 
 
 def parse_layout(operation: str, params: List[str]):
@@ -1,134 +1,180 @@
 """Four-dimensional chess board implementation."""
 from __future__ import annotations
 
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
-from game.rules import Coordinate, within_bounds
+from game.rules import Coordinate
 from game.utils import tensor_ops
 
 
 class Board:
     def __init__(self, shape: Coordinate) -> None:
-        self.shape: Coordinate = shape
-        self.grid = tensor_ops.create_tensor(shape, None)
+        self._set_shape(shape)
+        # Row-major flat storage; cells are addressed through ``_index``
+        self.grid: List[object] = tensor_ops.create_flat(shape, None)
         self.positions: Dict[object, Coordinate] = {}
+        # Per-owner occupancy bitboards; bit n is set when that owner holds grid cell n
+        self._occupancy: Dict[int, int] = {}
+
+    def _set_shape(self, shape: Coordinate) -> None:
+        self.shape: Coordinate = tuple(shape)  # type: ignore[assignment]
+        self._strides = tensor_ops.strides_of(self.shape)
+        self._sx, self._sy, self._sz, self._sw = self.shape
+
+    def _in_bounds(self, position: Coordinate) -> bool:
+        x, y, z, w = position
+        return 0 <= x < self._sx and 0 <= y < self._sy and 0 <= z < self._sz and 0 <= w < self._sw
+
+    def _index(self, position: Coordinate) -> int:
+        strides = self._strides
+        return position[0] * strides[0] + position[1] * strides[1] + position[2] * strides[2] + position[3]
+
+    def _position_of(self, index: int) -> Coordinate:
+        return tensor_ops.unravel_index(index, self.shape)  # type: ignore[return-value]
+
+    def _occupy(self, owner: int, index: int) -> None:
+        self._occupancy[owner] = self._occupancy.get(owner, 0) | (1 << index)
+
+    def _vacate(self, owner: int, index: int) -> None:
+        self._occupancy[owner] &= ~(1 << index)
+
+    def owner_bitboard(self, owner: int) -> int:
+        return self._occupancy.get(owner, 0)
+
+    def piece_count(self, owner: int) -> int:
+        return self._occupancy.get(owner, 0).bit_count()
 
     def reset(self) -> None:
-        self.grid = tensor_ops.create_tensor(self.shape, None)
+        # Only occupied cells need clearing; the grid itself is reused
+        for position in self.positions.values():
+            self.grid[self._index(position)] = None
         self.positions.clear()
+        self._occupancy.clear()
 
     def is_empty(self, position: Coordinate) -> bool:
         return self.get_piece(position) is None
 
     def get_piece(self, position: Coordinate):
-        if not within_bounds(position, self.shape):
+        if not self._in_bounds(position):
             return None
-        cell = self.grid[position[0]][position[1]][position[2]][position[3]]
-        return cell
+        return self.grid[self._index(position)]
 
     def place_piece(self, piece, position: Coordinate) -> None:
-        if not within_bounds(position, self.shape):
+        if not self._in_bounds(position):
             raise ValueError("Position out of bounds")
         if not self.is_empty(position):
             raise ValueError("Position already occupied")
-        self.grid[position[0]][position[1]][position[2]][position[3]] = piece
+        index = self._index(position)
+        self.grid[index] = piece
         self.positions[piece] = position
+        self._occupy(piece.owner, index)
 
     def move_piece(self, start: Coordinate, end: Coordinate) -> Optional[object]:
         piece = self.get_piece(start)
         if piece is None:
             raise ValueError("No piece at starting position")
+        if not self._in_bounds(end):
+            raise ValueError("Position out of bounds")
         captured = self.get_piece(end)
-        self.grid[end[0]][end[1]][end[2]][end[3]] = piece
-        self.grid[start[0]][start[1]][start[2]][start[3]] = None
+        start_index = self._index(start)
+        end_index = self._index(end)
+        self.grid[end_index] = piece
+        self.grid[start_index] = None
         self.positions[piece] = end
         if captured:
             self.positions.pop(captured, None)
+            self._vacate(captured.owner, end_index)
+        self._vacate(piece.owner, start_index)
+        self._occupy(piece.owner, end_index)
         return captured
 
     def remove_piece(self, position: Coordinate) -> Optional[object]:
         piece = self.get_piece(position)
         if piece is None:
             return None
-        self.grid[position[0]][position[1]][position[2]][position[3]] = None
+        index = self._index(position)
+        self.grid[index] = None
         self.positions.pop(piece, None)
+        self._vacate(piece.owner, index)
         return piece
 
     def remove_piece_object(self, piece) -> None:
         position = self.positions.pop(piece, None)
         if position:
-            self.grid[position[0]][position[1]][position[2]][position[3]] = None
+            index = self._index(position)
+            self.grid[index] = None
+            self._vacate(piece.owner, index)
 
     def iter_positions(self) -> Iterator[Tuple[Coordinate, object]]:
-        for x in range(self.shape[0]):
-            for y in range(self.shape[1]):
-                for z in range(self.shape[2]):
-                    for w in range(self.shape[3]):
-                        piece = self.grid[x][y][z][w]
-                        if piece is not None:
-                            yield (x, y, z, w), piece
+        for piece, position in self.positions.items():
+            yield position, piece
 
     def to_dict(self) -> Dict[str, object]:
-        pieces = []
-        for position, piece in self.iter_positions():
-            pieces.append(
-                {
-                    "type": piece.__class__.__name__,
-                    "owner": piece.owner,
-                    "position": position,
-                    "scratched": getattr(piece, "scratched", False),
-                    "has_moved": getattr(piece, "has_moved", False),
-                }
-            )
+        pieces = [
+            {
+                "type": type(piece).__name__,
+                "owner": piece.owner,
+                "position": position,
+                "scratched": piece.scratched,
+                "has_moved": piece.has_moved,
+            }
+            for piece, position in sorted(self.positions.items(), key=lambda entry: entry[1])
+        ]
         return {"shape": self.shape, "pieces": pieces}
 
-    def apply_layout(self, acting_piece, metadata: Dict[str, object]) -> None:
+    def apply_layout(self, acting_piece, metadata: Mapping[str, object]) -> None:
         if acting_piece not in self.positions:
             raise ValueError("Acting piece must be on the board")
         original_position = self.positions[acting_piece]
         self.remove_piece(original_position)
         operation = metadata["operation"]
         if operation == "transpose":
-            axes = metadata["axes"]
-            self.grid = tensor_ops.transpose(self.grid, axes)
-            self.shape = tensor_ops.shape_of(self.grid)  # type: ignore[assignment]
+            self.grid, shape = tensor_ops.transpose_flat(self.grid, self.shape, metadata["axes"])
         elif operation == "swap_axis":
             axis_a, axis_b = metadata["axes"]
-            self.grid = tensor_ops.swap_axes(self.grid, axis_a, axis_b)
-            self.shape = tensor_ops.shape_of(self.grid)  # type: ignore[assignment]
+            self.grid, shape = tensor_ops.swap_axes_flat(self.grid, self.shape, axis_a, axis_b)
         elif operation == "move_axis":
-            self.grid = tensor_ops.move_axis(self.grid, metadata["source"], metadata["destination"])
-            self.shape = tensor_ops.shape_of(self.grid)  # type: ignore[assignment]
+            self.grid, shape = tensor_ops.move_axis_flat(self.grid, self.shape, metadata["source"], metadata["destination"])
         elif operation == "reshape_axis":
-            new_shape = metadata["new_shape"]
-            self.grid = tensor_ops.reshape_tensor(self.grid, new_shape)
-            self.shape = tuple(new_shape)  # type: ignore[assignment]
+            self.grid, shape = tensor_ops.reshape_flat(self.grid, metadata["new_shape"])
         else:
             raise ValueError(f"Unknown layout operation {operation}")
-        self._rebuild_positions()
-        occupant = self.get_piece(original_position)
-        if occupant is not None:
-            self.remove_piece(original_position)
-        if not within_bounds(original_position, self.shape):
+        self._set_shape(shape)  # type: ignore[arg-type]
+        self._rebuild_positions(vacate=original_position)
+        if not self._in_bounds(original_position):
             raise ValueError("Layout operation invalidated acting piece position")
-        if not self.is_empty(original_position):
-            raise ValueError("Acting position must be empty after layout")
-        self.grid[original_position[0]][original_position[1]][original_position[2]][original_position[3]] = acting_piece
+        index = self._index(original_position)
+        self.grid[index] = acting_piece
         self.positions[acting_piece] = original_position
+        self._occupy(acting_piece.owner, index)
 
-    def _rebuild_positions(self) -> None:
+    def _rebuild_positions(self, vacate: Optional[Coordinate] = None) -> None:
+        # A piece that lands on ``vacate`` is dropped from the board in the same pass
+        vacate_index = self._index(vacate) if vacate is not None and self._in_bounds(vacate) else -1
         self.positions.clear()
-        for position, piece in self.iter_positions():
-            self.positions[piece] = position
+        self._occupancy.clear()
+        for index, piece in enumerate(self.grid):
+            if piece is None:
+                continue
+            if index == vacate_index:
+                self.grid[index] = None
+                continue
+            self.positions[piece] = self._position_of(index)
+            self._occupy(piece.owner, index)
 
     @classmethod
     def from_dict(cls, data: Dict[str, object], piece_factory) -> "Board":
         shape = tuple(data["shape"])  # type: ignore[assignment]
         board = cls(shape)  # type: ignore[arg-type]
         for piece_data in data["pieces"]:
+            position: Coordinate = tuple(piece_data["position"])  # type: ignore[assignment]
+            if not board._in_bounds(position):
+                raise ValueError("Position out of bounds")
             piece = piece_factory(piece_data)
-            board.grid[piece_data["position"][0]][piece_data["position"][1]][piece_data["position"][2]][piece_data["position"][3]] = piece
-            board.positions[piece] = tuple(piece_data["position"])  # type: ignore[assignment]
+            index = board._index(position)
+            board.grid[index] = piece
+            board.positions[piece] = position
+            board._occupy(piece.owner, index)
         return board
 
 
@@ -1,12 +1,13 @@
 """Main engine orchestrating the 4D chess game."""
 from __future__ import annotations
 
+import itertools
 import json
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 from game.board import Board
-from game.pieces.alien import Alien
+from game.pieces.alien import LAYOUT_TARGET, Alien
 from game.pieces.cat import Cat
 from game.pieces.standard_pieces import Bishop, King, Knight, Pawn, Queen, Rook
 from game.rules import Coordinate, Move, MovementProfile, MovementRules, coordinate_to_string, within_bounds
@@ -18,6 +19,23 @@ class Player:
     name: str
 
 
+_PIECE_MAP = {
+    "King": King,
+    "Queen": Queen,
+    "Rook": Rook,
+    "Bishop": Bishop,
+    "Knight": Knight,
+    "Pawn": Pawn,
+    "Cat": Cat,
+    "Alien": Alien,
+}
+
+
+def _interior_first(dimension: int) -> List[int]:
+    # Prefer interior coordinates to reduce conflicts between orientations
+    return sorted(range(dimension), key=lambda value: (value in (0, dimension - 1), value))
+
+
 class GameEngine:
     def __init__(self, board_shape: Coordinate = (4, 4, 4, 4), num_players: int = 2) -> None:
         if num_players < 2 or num_players > 4:
@@ -30,6 +48,7 @@ class GameEngine:
         self.rules = MovementRules(board_shape, self.pawn_profiles)
         self._captured: Dict[int, List[str]] = {player.identifier: [] for player in self.players}
         self._king_positions: Dict[int, Coordinate] = {}
+        self._aliens: Dict[int, Alien] = {}
         self._setup_initial_state()
 
     # Player and turn management -------------------------------------------------
@@ -78,27 +97,11 @@ class GameEngine:
                 self._deploy_pawns(player.identifier, pawn_positions, occupied)
 
     def _available_positions(self, axis: int, axis_value: int, occupied: set[Coordinate]) -> Iterable[Coordinate]:
-        ranges = [self._ordered_axis_values(i, axis) for i in range(4)]
-        for coord in self._iterate_coordinates(ranges):
-            if coord[axis] != axis_value:
-                continue
+        ranges = [[axis_value] if index == axis else _interior_first(dimension) for index, dimension in enumerate(self.board.shape)]
+        for coord in itertools.product(*ranges):
             if coord in occupied:
                 continue
-            yield coord
-
-    def _ordered_axis_values(self, axis_index: int, orientation_axis: int) -> List[int]:
-        dimension = self.board.shape[axis_index]
-        values = list(range(dimension))
-        # Prefer interior coordinates to reduce conflicts between orientations
-        center_order = sorted(values, key=lambda value: (value in (0, dimension - 1), value))
-        return center_order
-
-    def _iterate_coordinates(self, ranges: List[Iterable[int]]) -> Iterable[Coordinate]:
-        for x in ranges[0]:
-            for y in ranges[1]:
-                for z in ranges[2]:
-                    for w in ranges[3]:
-                        yield (x, y, z, w)
+            yield coord  # type: ignore[misc]
 
     def _deploy_back_rank(self, owner: int, positions: Iterable[Coordinate], occupied: set[Coordinate]) -> None:
         sequence = [Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook, Cat, Alien]
@@ -112,6 +115,8 @@ class GameEngine:
             occupied.add(position)
             if isinstance(piece, King):
                 self._king_positions[owner] = position
+            elif isinstance(piece, Alien):
+                self._aliens[owner] = piece
 
     def _deploy_pawns(self, owner: int, positions: Iterable[Coordinate], occupied: set[Coordinate]) -> None:
         count = 0
@@ -134,6 +139,12 @@ class GameEngine:
             return []
         return piece.get_moves(self.board, position, self.rules)
 
+    def legal_ordinary_moves_from(self, position: Coordinate) -> List[Move]:
+        piece = self.board.get_piece(position)
+        if piece is None:
+            return []
+        return piece.get_ordinary_moves(self.board, position, self.rules)
+
     def legal_moves_for_player(self, player_id: int) -> List[Move]:
         moves: List[Move] = []
         for position, piece in self.board.iter_positions():
@@ -148,9 +159,9 @@ class GameEngine:
             raise ValueError("No piece at the starting coordinate")
         if piece.owner != player_id:
             raise ValueError("Piece does not belong to the player")
-        legal_moves = [move for move in piece.get_moves(self.board, start, self.rules) if move.end == end]
+        legal_moves = piece.get_moves_to(self.board, start, self.rules, end)
         if metadata:
-            legal_moves = [move for move in legal_moves if move.metadata == metadata or all(item in move.metadata.items() for item in metadata.items())]
+            legal_moves = [move for move in legal_moves if metadata.items() <= move.metadata.items()]
         if not legal_moves:
             raise ValueError("Illegal move")
         selected = legal_moves[0]
@@ -161,8 +172,7 @@ class GameEngine:
             target_piece.mark_scratched()
             result = f"{piece.name} scratched {target_piece.name} at {coordinate_to_string(end)}"
         elif selected.move_type == "layout":
-            self.board.apply_layout(piece, selected.metadata)
-            self.rules = MovementRules(self.board.shape, self.pawn_profiles)
+            self._apply_layout(piece, selected.metadata)
             result = f"{piece.name} executed {selected.metadata['operation']}"
         else:
             captured = self.board.move_piece(start, end)
@@ -173,6 +183,8 @@ class GameEngine:
                 result += f" capturing {captured.name}"
                 if isinstance(captured, King):
                     self._eliminate_player(captured.owner)
+                elif isinstance(captured, Alien) and self._aliens.get(captured.owner) is captured:
+                    del self._aliens[captured.owner]
             if isinstance(piece, King):
                 self._king_positions[player_id] = end
         self.next_turn()
@@ -184,18 +196,33 @@ class GameEngine:
             raise ValueError("Player does not control an Alien")
         alien_piece = self.board.get_piece(alien_position)
         assert alien_piece is not None
-        layout_move = [move for move in alien_piece.get_moves(self.board, alien_position, self.rules) if move.move_type == "layout" and move.metadata["operation"] == metadata["operation"]]
+        layout_moves = alien_piece.get_moves_to(self.board, alien_position, self.rules, LAYOUT_TARGET)
+        layout_move = [move for move in layout_moves if move.move_type == "layout" and move.metadata["operation"] == metadata["operation"]]
         if not layout_move:
             raise ValueError("Invalid layout operation")
-        self.board.apply_layout(alien_piece, metadata)
-        self.rules = MovementRules(self.board.shape, self.pawn_profiles)
+        self._apply_layout(alien_piece, metadata)
         self.next_turn()
         return f"Alien performed {metadata['operation']}"
 
+    def _apply_layout(self, piece, metadata: Mapping[str, object]) -> None:
+        previous_shape = self.board.shape
+        self.board.apply_layout(piece, metadata)
+        # Rules only depend on the shape, so keep them (and their caches) when it is unchanged
+        if self.board.shape != previous_shape:
+            self.rules = MovementRules(self.board.shape, self.pawn_profiles)
+
     def _find_alien(self, player_id: int) -> Optional[Coordinate]:
-        for position, piece in self.board.iter_positions():
-            if piece.owner == player_id and isinstance(piece, Alien):
+        alien = self._aliens.get(player_id)
+        if alien is not None:
+            position = self.board.positions.get(alien)
+            if position is not None:
+                return position
+        # The index is stale when the board was swapped or pieces were placed directly
+        for piece, position in self.board.positions.items():
+            if isinstance(piece, Alien) and piece.owner == player_id:
+                self._aliens[player_id] = piece
                 return position
+        self._aliens.pop(player_id, None)
         return None
 
     def _eliminate_player(self, player_id: int) -> None:
@@ -215,13 +242,14 @@ class GameEngine:
     def save(self, path: str) -> None:
         data = {
             "board": self.board.to_dict(),
-            "players": [player.__dict__ for player in self.players],
+            "players": [asdict(player) for player in self.players],
             "turn_index": self.turn_index,
             "active_players": self.active_players,
-            "captured": self._captured,
+            "captured": [[player_id, names] for player_id, names in self._captured.items()],
         }
+        # json.dumps takes the C encoder fast path; json.dump with indent does not
         with open(path, "w", encoding="utf-8") as handle:
-            json.dump(data, handle, indent=2)
+            handle.write(json.dumps(data, separators=(",", ":")))
 
     @classmethod
     def load(cls, path: str) -> "GameEngine":
@@ -231,47 +259,42 @@ class GameEngine:
         shape = tuple(data["board"]["shape"])
         engine = cls(shape, len(players))
         engine.players = players
+        engine._king_positions.clear()
+        engine._aliens.clear()
         engine.board = Board.from_dict(data["board"], engine._piece_from_data)
         engine.turn_index = data["turn_index"]
         engine.active_players = data["active_players"]
-        engine._captured = {int(k): v for k, v in data["captured"].items()}
+        captured = data["captured"]
+        if isinstance(captured, dict):
+            # Older saves stored captures as a JSON object keyed by stringified player id
+            engine._captured = {int(player_id): names for player_id, names in captured.items()}
+        else:
+            engine._captured = {player_id: names for player_id, names in captured}
         engine.rules = MovementRules(engine.board.shape, engine.pawn_profiles)
-        engine._recalculate_kings()
         return engine
 
+    def replace_state(self, other: "GameEngine") -> None:
+        # Adopt every attribute of ``other`` (e.g. a freshly loaded game) so no index is left behind
+        self.__dict__.update(vars(other))
+
     def _piece_from_data(self, data: Dict[str, object]):
-        piece_type = data["type"]
         owner = data["owner"]
-        piece_map = {
-            "King": King,
-            "Queen": Queen,
-            "Rook": Rook,
-            "Bishop": Bishop,
-            "Knight": Knight,
-            "Pawn": Pawn,
-            "Cat": Cat,
-            "Alien": Alien,
-        }
-        cls = piece_map[piece_type]
+        cls = _PIECE_MAP[data["type"]]
         piece = cls(owner)
         piece.scratched = data.get("scratched", False)
         piece.has_moved = data.get("has_moved", False)
         if isinstance(piece, King):
             self._king_positions[owner] = tuple(data["position"])  # type: ignore[assignment]
+        elif isinstance(piece, Alien):
+            self._aliens[owner] = piece
         return piece
 
-    def _recalculate_kings(self) -> None:
-        self._king_positions.clear()
-        for position, piece in self.board.iter_positions():
-            if isinstance(piece, King):
-                self._king_positions[piece.owner] = position
-
     # Debug utilities ------------------------------------------------------------
     def board_snapshot(self) -> List[str]:
-        snapshot: List[str] = []
-        for position, piece in self.board.iter_positions():
-            snapshot.append(f"{piece.name}@{coordinate_to_string(position)}")
-        return snapshot
+        return [
+            f"{piece.name}@{coordinate_to_string(position)}"
+            for piece, position in sorted(self.board.positions.items(), key=lambda entry: entry[1])
+        ]
 
 
 __all__ = ["GameEngine", "Player"]
@@ -1,16 +1,25 @@
 """Implementation of the Alien piece with layout powers."""
 from __future__ import annotations
 
+import functools
 import itertools
-from typing import List, Tuple
+import math
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
 
 from game.pieces.base_piece import BasePiece
-from game.rules import Coordinate, Move, MovementRules, add_coordinates, king_offsets, within_bounds
+from game.rules import CAPTURE_METADATA, NON_CAPTURE_METADATA, Coordinate, Move, MovementRules
+
+
+# Layout moves are not tied to a square and use this sentinel for start and end
+LAYOUT_TARGET: Coordinate = (-1, -1, -1, -1)
 
 
 class Alien(BasePiece):
     """The Alien can manipulate the entire board layout."""
 
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="Alien", symbol="A")
 
@@ -21,95 +30,90 @@ class Alien(BasePiece):
         return alien
 
     def generate_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
+        moves = self._step_moves(board, position, rules)
+        # Layout operations
+        moves.extend(self._layout_moves(rules))
+        return moves
+
+    def get_ordinary_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
+        if self.scratched:
+            return super().get_ordinary_moves(board, position, rules)
+        return self._step_moves(board, position, rules)
+
+    def get_moves_to(self, board, position: Coordinate, rules: MovementRules, end: Coordinate) -> List[Move]:
+        if self.scratched:
+            return super().get_moves_to(board, position, rules, end)
+        if end == LAYOUT_TARGET:
+            return self._layout_moves(rules)
+        return [move for move in self._step_moves(board, position, rules) if move.end == end]
+
+    def _step_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
         moves: List[Move] = []
         # Local moves similar to a king
-        for offset in king_offsets():
-            target = add_coordinates(position, offset)
-            if not within_bounds(target, rules.board_shape):
-                continue
+        for target in rules.king_neighbors(position):
             occupant = board.get_piece(target)
             if occupant is None or occupant.owner != self.owner:
                 move_type = "capture" if occupant else "move"
-                moves.append(Move(piece=self, start=position, end=target, move_type=move_type, metadata={"capture": bool(occupant)}))
-        # Layout operations
-        moves.extend(self._layout_moves(rules))
+                moves.append(Move(piece=self, start=position, end=target, move_type=move_type, metadata=CAPTURE_METADATA if occupant else NON_CAPTURE_METADATA))
         return moves
 
     def _layout_moves(self, rules: MovementRules) -> List[Move]:
-        shape = rules.board_shape
-        layout_moves: List[Move] = []
-        axes = tuple(range(len(shape)))
-        for perm in itertools.permutations(axes):
-            if perm == axes:
+        return [
+            Move(piece=self, start=LAYOUT_TARGET, end=LAYOUT_TARGET, move_type="layout", metadata=metadata)
+            for metadata in _layout_move_templates(tuple(rules.board_shape))
+        ]
+
+
+@functools.lru_cache(maxsize=32)
+def _layout_move_templates(shape: Tuple[int, ...]) -> Tuple[Mapping[str, object], ...]:
+    templates: List[Dict[str, object]] = []
+    axes = tuple(range(len(shape)))
+    for perm in itertools.permutations(axes):
+        if perm == axes:
+            continue
+        templates.append({"operation": "transpose", "axes": perm})
+    for i in axes:
+        for j in axes:
+            if i >= j:
                 continue
-            layout_moves.append(
-                Move(
-                    piece=self,
-                    start=(-1, -1, -1, -1),
-                    end=(-1, -1, -1, -1),
-                    move_type="layout",
-                    metadata={"operation": "transpose", "axes": perm},
-                )
-            )
-        for i in axes:
-            for j in axes:
-                if i >= j:
-                    continue
-                layout_moves.append(
-                    Move(
-                        piece=self,
-                        start=(-1, -1, -1, -1),
-                        end=(-1, -1, -1, -1),
-                        move_type="layout",
-                        metadata={"operation": "swap_axis", "axes": (i, j)},
-                    )
-                )
-        for src in axes:
-            for dst in axes:
-                if src == dst:
+            templates.append({"operation": "swap_axis", "axes": (i, j)})
+    for src in axes:
+        for dst in axes:
+            if src == dst:
+                continue
+            templates.append({"operation": "move_axis", "source": src, "destination": dst})
+    for i in axes:
+        for j in axes:
+            if i >= j:
+                continue
+            product = shape[i] * shape[j]
+            for factor in _factor_pairs(product):
+                new_shape = list(shape)
+                new_shape[i] = factor[0]
+                new_shape[j] = factor[1]
+                if tuple(new_shape) == shape:
                     continue
-                layout_moves.append(
-                    Move(
-                        piece=self,
-                        start=(-1, -1, -1, -1),
-                        end=(-1, -1, -1, -1),
-                        move_type="layout",
-                        metadata={"operation": "move_axis", "source": src, "destination": dst},
-                    )
+                templates.append(
+                    {
+                        "operation": "reshape_axis",
+                        "axis_pair": (i, j),
+                        "new_shape": tuple(new_shape),
+                    }
                 )
-        for i in axes:
-            for j in axes:
-                if i >= j:
-                    continue
-                product = shape[i] * shape[j]
-                for factor in _factor_pairs(product):
-                    new_shape = list(shape)
-                    new_shape[i] = factor[0]
-                    new_shape[j] = factor[1]
-                    if tuple(new_shape) == shape:
-                        continue
-                    layout_moves.append(
-                        Move(
-                            piece=self,
-                            start=(-1, -1, -1, -1),
-                            end=(-1, -1, -1, -1),
-                            move_type="layout",
-                            metadata={
-                                "operation": "reshape_axis",
-                                "axis_pair": (i, j),
-                                "new_shape": tuple(new_shape),
-                            },
-                        )
-                    )
-        return layout_moves
-
-
-def _factor_pairs(number: int) -> List[Tuple[int, int]]:
-    pairs: List[Tuple[int, int]] = []
-    for i in range(1, number + 1):
+    # Templates are shared between moves, so hand them out read-only
+    return tuple(MappingProxyType(template) for template in templates)
+
+
+@functools.lru_cache(maxsize=256)
+def _factor_pairs(number: int) -> Tuple[Tuple[int, int], ...]:
+    lower: List[Tuple[int, int]] = []
+    upper: List[Tuple[int, int]] = []
+    for i in range(1, math.isqrt(number) + 1):
         if number % i == 0:
-            pairs.append((i, number // i))
-    return pairs
+            lower.append((i, number // i))
+            if i * i != number:
+                upper.append((number // i, i))
+    return tuple(lower + upper[::-1])
 
 
-__all__ = ["Alien"]
+__all__ = ["Alien", "LAYOUT_TARGET"]
@@ -1,33 +1,43 @@
 """Base class for all chess pieces."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import List, Optional, TYPE_CHECKING
 
-from game.rules import Coordinate, Move, MovementRules, add_coordinates, within_bounds
+from game.rules import CAPTURE_METADATA, Coordinate, Move, MovementRules
 
 if TYPE_CHECKING:
     from game.board import Board
 
 
-@dataclass(unsafe_hash=True)
+@dataclass(eq=False, slots=True)
 class BasePiece:
     owner: int
     name: str
     symbol: str
     scratched: bool = False
     has_moved: bool = False
+    _scratched_adapter: Optional["PawnAdapter"] = field(default=None, init=False, repr=False)
 
     def clone(self) -> "BasePiece":
         return type(self)(self.owner)  # type: ignore[call-arg]
 
     def get_moves(self, board: "Board", position: Coordinate, rules: MovementRules) -> List[Move]:
         if self.scratched and not isinstance(self, PawnAdapter):
-            adapter = PawnAdapter(self.owner, name=f"Scratched-{self.name}", symbol=self.symbol.lower())
+            adapter = self._scratched_adapter
+            if adapter is None:
+                adapter = PawnAdapter(self.owner, name=f"Scratched-{self.name}", symbol=self.symbol.lower())
+                self._scratched_adapter = adapter
             adapter.has_moved = self.has_moved
             return adapter.generate_pawn_moves(board, position, rules)
         return self.generate_moves(board, position, rules)
 
+    def get_ordinary_moves(self, board: "Board", position: Coordinate, rules: MovementRules) -> List[Move]:
+        return self.get_moves(board, position, rules)
+
+    def get_moves_to(self, board: "Board", position: Coordinate, rules: MovementRules, end: Coordinate) -> List[Move]:
+        return [move for move in self.get_moves(board, position, rules) if move.end == end]
+
     def generate_moves(self, board: "Board", position: Coordinate, rules: MovementRules) -> List[Move]:
         raise NotImplementedError
 
@@ -36,6 +46,8 @@ class BasePiece:
 
 
 class PawnAdapter(BasePiece):
+    __slots__ = ()
+
     def __init__(self, owner: int, name: str = "Pawn", symbol: str = "P") -> None:
         super().__init__(owner=owner, name=name, symbol=symbol)
 
@@ -43,31 +55,27 @@ class PawnAdapter(BasePiece):
         return self.generate_pawn_moves(board, position, rules)
 
     def generate_pawn_moves(self, board: "Board", position: Coordinate, rules: MovementRules) -> List[Move]:
+        # Specialized for four axes: coordinates are added and bounds-checked inline
         moves: List[Move] = []
         profile = rules.pawn_directions[self.owner]
-        forward = [0, 0, 0, 0]
-        forward[profile.axis] = profile.direction
-        forward_tuple: Coordinate = tuple(forward)  # type: ignore[assignment]
-        one_step = add_coordinates(position, forward_tuple)
-        if within_bounds(one_step, rules.board_shape) and board.is_empty(one_step):
+        s0, s1, s2, s3 = rules.board_shape
+        p0, p1, p2, p3 = position
+        f0, f1, f2, f3 = profile.forward_vector
+        one_step = (p0 + f0, p1 + f1, p2 + f2, p3 + f3)
+        if 0 <= one_step[0] < s0 and 0 <= one_step[1] < s1 and 0 <= one_step[2] < s2 and 0 <= one_step[3] < s3 and board.is_empty(one_step):
             moves.append(Move(piece=self, start=position, end=one_step))
             if not self.has_moved and profile.is_home(position):
-                two_step = add_coordinates(one_step, forward_tuple)
-                if within_bounds(two_step, rules.board_shape) and board.is_empty(two_step):
+                two_step = (p0 + 2 * f0, p1 + 2 * f1, p2 + 2 * f2, p3 + 2 * f3)
+                if 0 <= two_step[0] < s0 and 0 <= two_step[1] < s1 and 0 <= two_step[2] < s2 and 0 <= two_step[3] < s3 and board.is_empty(two_step):
                     moves.append(Move(piece=self, start=position, end=two_step))
         # Capture moves
-        for axis in range(len(position)):
-            if axis == profile.axis:
+        for o0, o1, o2, o3 in profile.capture_offsets:
+            target = (p0 + o0, p1 + o1, p2 + o2, p3 + o3)
+            if not (0 <= target[0] < s0 and 0 <= target[1] < s1 and 0 <= target[2] < s2 and 0 <= target[3] < s3):
                 continue
-            for side in (-1, 1):
-                offset = list(forward_tuple)
-                offset[axis] = side
-                target = add_coordinates(position, tuple(offset))  # type: ignore[arg-type]
-                if not within_bounds(target, rules.board_shape):
-                    continue
-                target_piece = board.get_piece(target)
-                if target_piece and target_piece.owner != self.owner:
-                    moves.append(Move(piece=self, start=position, end=target, move_type="capture", metadata={"capture": True}))
+            target_piece = board.get_piece(target)
+            if target_piece and target_piece.owner != self.owner:
+                moves.append(Move(piece=self, start=position, end=target, move_type="capture", metadata=CAPTURE_METADATA))
         return moves
 
 
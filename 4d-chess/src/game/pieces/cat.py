@@ -1,15 +1,17 @@
 """Implementation of the Cat piece."""
 from __future__ import annotations
 
-from typing import List, Set, Tuple
+from typing import List, Tuple
 
 from game.pieces.base_piece import BasePiece
-from game.rules import Coordinate, Move, MovementRules, add_coordinates, within_bounds
+from game.rules import Coordinate, Move, MovementRules, within_bounds
 
 
 class Cat(BasePiece):
     """The Cat jumps between dimensions and can scratch pieces."""
 
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="Cat", symbol="C")
 
@@ -21,7 +23,10 @@ class Cat(BasePiece):
 
     def generate_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
         moves: List[Move] = []
-        seen: Set[Coordinate] = set()
+        # Visited squares as a bitmask over flat cell numbers
+        seen = 0
+        s0, s1, s2, _ = rules.strides
+        shape = rules.board_shape
         # Jump by swapping dimensions while keeping other coordinates
         axes = range(len(position))
         for i in axes:
@@ -31,28 +36,35 @@ class Cat(BasePiece):
                 permuted = list(position)
                 permuted[i], permuted[j] = permuted[j], permuted[i]
                 target = tuple(permuted)  # type: ignore[assignment]
-                if target == position or target in seen:
+                if target == position or not within_bounds(target, shape):
+                    continue
+                bit = 1 << (target[0] * s0 + target[1] * s1 + target[2] * s2 + target[3])
+                if seen & bit:
                     continue
-                seen.add(target)
+                seen |= bit
                 moves.extend(self._move_or_scratch(board, position, target))
-        # Move along a line while exchanging dimensional influence
-        max_delta = max(rules.board_shape)
+        # Move along a line while exchanging dimensional influence. Only deltas that keep
+        # both axes on the board are visited; (b, a, -delta) repeats (a, b, delta), so
+        # each unordered axis pair is walked once.
         for axis_from in axes:
             for axis_to in axes:
-                if axis_from == axis_to:
+                if axis_from >= axis_to:
                     continue
-                for delta in range(-max_delta + 1, max_delta):
+                source = position[axis_from]
+                sink = position[axis_to]
+                lowest = max(-source, sink - shape[axis_to] + 1)
+                highest = min(shape[axis_from] - 1 - source, sink)
+                for delta in range(lowest, highest + 1):
                     if delta == 0:
                         continue
-                    vector = [0, 0, 0, 0]
-                    vector[axis_from] = delta
-                    vector[axis_to] = -delta
-                    target = add_coordinates(position, tuple(vector))  # type: ignore[arg-type]
-                    if target == position or target in seen:
-                        continue
-                    if not within_bounds(target, rules.board_shape):
+                    shifted = list(position)
+                    shifted[axis_from] = source + delta
+                    shifted[axis_to] = sink - delta
+                    target = tuple(shifted)  # type: ignore[assignment]
+                    bit = 1 << (target[0] * s0 + target[1] * s1 + target[2] * s2 + target[3])
+                    if seen & bit:
                         continue
-                    seen.add(target)
+                    seen |= bit
                     moves.extend(self._move_or_scratch(board, position, target))
         return moves
 
@@ -5,86 +5,103 @@ from typing import Iterable, List
 
 from game.pieces.base_piece import BasePiece, PawnAdapter
 from game.rules import (
+    CAPTURE_METADATA,
+    NON_CAPTURE_METADATA,
     Coordinate,
     Move,
     MovementRules,
     add_coordinates,
     bishop_directions,
-    king_offsets,
     knight_offsets,
+    queen_directions,
+    ray_length,
     rook_directions,
-    within_bounds,
 )
 
+_ROOK_DIRECTIONS = rook_directions()
+_BISHOP_DIRECTIONS = bishop_directions()
+_QUEEN_DIRECTIONS = queen_directions()
+_KNIGHT_OFFSETS = knight_offsets()
+
 
 class SlidingPiece(BasePiece):
+    __slots__ = ()
+
     def generate_sliding_moves(self, board, position: Coordinate, rules: MovementRules, directions: Iterable[Coordinate]) -> List[Move]:
         moves: List[Move] = []
+        shape = rules.board_shape
+        get_piece = board.get_piece
         for direction in directions:
             current = position
-            while True:
+            # Clip the ray up front so each step only has to look at occupancy
+            for _ in range(ray_length(position, direction, shape)):
                 current = add_coordinates(current, direction)
-                if not within_bounds(current, rules.board_shape):
-                    break
-                occupant = board.get_piece(current)
+                occupant = get_piece(current)
                 if occupant is None:
                     moves.append(Move(piece=self, start=position, end=current))
                     continue
                 if occupant.owner != self.owner:
-                    moves.append(Move(piece=self, start=position, end=current, move_type="capture", metadata={"capture": True}))
+                    moves.append(Move(piece=self, start=position, end=current, move_type="capture", metadata=CAPTURE_METADATA))
                 break
         return moves
 
 
 class Rook(SlidingPiece):
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="Rook", symbol="R")
 
     def generate_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
-        return self.generate_sliding_moves(board, position, rules, rook_directions())
+        return self.generate_sliding_moves(board, position, rules, _ROOK_DIRECTIONS)
 
     def clone(self) -> "Rook":
         return Rook(self.owner)
 
 
 class Bishop(SlidingPiece):
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="Bishop", symbol="B")
 
     def generate_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
-        return self.generate_sliding_moves(board, position, rules, bishop_directions())
+        return self.generate_sliding_moves(board, position, rules, _BISHOP_DIRECTIONS)
 
     def clone(self) -> "Bishop":
         return Bishop(self.owner)
 
 
 class Queen(SlidingPiece):
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="Queen", symbol="Q")
 
     def generate_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
-        directions = rook_directions() + bishop_directions()
-        return self.generate_sliding_moves(board, position, rules, directions)
+        return self.generate_sliding_moves(board, position, rules, _QUEEN_DIRECTIONS)
 
     def clone(self) -> "Queen":
         return Queen(self.owner)
 
 
 class King(BasePiece):
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="King", symbol="K")
 
     def generate_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
         moves: List[Move] = []
-        for offset in king_offsets():
-            target = add_coordinates(position, offset)
-            if not within_bounds(target, rules.board_shape):
-                continue
-            occupant = board.get_piece(target)
+        append = moves.append
+        get_piece = board.get_piece
+        owner = self.owner
+        for target in rules.king_neighbors(position):
+            occupant = get_piece(target)
             if occupant is None:
-                moves.append(Move(piece=self, start=position, end=target))
-            elif occupant.owner != self.owner:
-                moves.append(Move(piece=self, start=position, end=target, move_type="capture", metadata={"capture": True}))
+                append(Move(piece=self, start=position, end=target))
+            elif occupant.owner != owner:
+                append(Move(piece=self, start=position, end=target, move_type="capture", metadata=CAPTURE_METADATA))
         return moves
 
     def clone(self) -> "King":
@@ -92,19 +109,28 @@ class King(BasePiece):
 
 
 class Knight(BasePiece):
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="Knight", symbol="N")
 
     def generate_moves(self, board, position: Coordinate, rules: MovementRules) -> List[Move]:
         moves: List[Move] = []
-        for offset in knight_offsets():
-            target = add_coordinates(position, offset)
-            if not within_bounds(target, rules.board_shape):
+        append = moves.append
+        get_piece = board.get_piece
+        owner = self.owner
+        s0, s1, s2, s3 = rules.board_shape
+        p0, p1, p2, p3 = position
+        for d0, d1, d2, d3 in _KNIGHT_OFFSETS:
+            t0, t1, t2, t3 = p0 + d0, p1 + d1, p2 + d2, p3 + d3
+            if not (0 <= t0 < s0 and 0 <= t1 < s1 and 0 <= t2 < s2 and 0 <= t3 < s3):
                 continue
-            occupant = board.get_piece(target)
-            if occupant is None or occupant.owner != self.owner:
-                move_type = "capture" if occupant else "move"
-                moves.append(Move(piece=self, start=position, end=target, move_type=move_type, metadata={"capture": bool(occupant)}))
+            target = (t0, t1, t2, t3)
+            occupant = get_piece(target)
+            if occupant is None:
+                append(Move(piece=self, start=position, end=target, metadata=NON_CAPTURE_METADATA))
+            elif occupant.owner != owner:
+                append(Move(piece=self, start=position, end=target, move_type="capture", metadata=CAPTURE_METADATA))
         return moves
 
     def clone(self) -> "Knight":
@@ -112,6 +138,8 @@ class Knight(BasePiece):
 
 
 class Pawn(PawnAdapter):
+    __slots__ = ()
+
     def __init__(self, owner: int) -> None:
         super().__init__(owner=owner, name="Pawn", symbol="P")
 
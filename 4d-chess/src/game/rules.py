@@ -1,35 +1,80 @@
 """Core rules and data structures for the 4D chess engine."""
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from game.utils import tensor_ops
 
 Coordinate = Tuple[int, int, int, int]
 
+# Shared read-only metadata so generators do not allocate a dict per move
+EMPTY_METADATA: Mapping[str, object] = MappingProxyType({})
+CAPTURE_METADATA: Mapping[str, object] = MappingProxyType({"capture": True})
+NON_CAPTURE_METADATA: Mapping[str, object] = MappingProxyType({"capture": False})
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MovementProfile:
     axis: int
     direction: int
     home_coordinates: Tuple[int, ...]
+    forward_vector: Coordinate = field(init=False, repr=False, compare=False)
+    capture_offsets: Tuple[Coordinate, ...] = field(init=False, repr=False, compare=False)
+    home_set: frozenset[int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Profiles are frozen and hashable, so accept any sequence but store a tuple
+        object.__setattr__(self, "home_coordinates", tuple(self.home_coordinates))
+        # The profile is immutable, so the step and diagonal capture offsets are fixed per profile
+        forward = [0, 0, 0, 0]
+        forward[self.axis] = self.direction
+        captures = []
+        for axis in range(4):
+            if axis == self.axis:
+                continue
+            for side in (-1, 1):
+                offset = forward.copy()
+                offset[axis] = side
+                captures.append(tuple(offset))
+        object.__setattr__(self, "forward_vector", tuple(forward))
+        object.__setattr__(self, "capture_offsets", tuple(captures))
+        object.__setattr__(self, "home_set", frozenset(self.home_coordinates))
 
     def is_home(self, position: Coordinate) -> bool:
-        return position[self.axis] == self.home_coordinates[0]
+        return position[self.axis] in self.home_set
 
 
 @dataclass
 class MovementRules:
     board_shape: Coordinate
     pawn_directions: Dict[int, MovementProfile]
+    strides: Tuple[int, ...] = field(init=False, repr=False, compare=False)
+    _neighbor_cache: Dict[Coordinate, Tuple[Coordinate, ...]] = field(default_factory=dict, init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        self.board_shape = tuple(self.board_shape)  # type: ignore[assignment]
+        # Row-major strides, matching the Board's flat cell numbering
+        self.strides = tensor_ops.strides_of(self.board_shape)
 
-@dataclass
+    def king_neighbors(self, position: Coordinate) -> Tuple[Coordinate, ...]:
+        neighbors = self._neighbor_cache.get(position)
+        if neighbors is None:
+            candidates = (add_coordinates(position, offset) for offset in _KING_OFFSETS)
+            neighbors = tuple(target for target in candidates if within_bounds(target, self.board_shape))
+            self._neighbor_cache[position] = neighbors
+        return neighbors
+
+
+@dataclass(frozen=True, slots=True)
 class Move:
     piece: "BasePiece"
     start: Coordinate
     end: Coordinate
     move_type: str = "move"  # move, capture, scratch, layout
-    metadata: Dict[str, object] = field(default_factory=dict)
+    metadata: Mapping[str, object] = field(default_factory=lambda: EMPTY_METADATA)
 
     @property
     def is_capture(self) -> bool:
@@ -44,19 +89,36 @@ class Move:
         return f"{self.piece.name} {self.start} -> {self.end}{meta}"
 
 
+# Coordinates are always four lanes wide, so the hot helpers are unrolled by hand
 def within_bounds(position: Coordinate, shape: Coordinate) -> bool:
-    return all(0 <= coord < dim for coord, dim in zip(position, shape))
+    return 0 <= position[0] < shape[0] and 0 <= position[1] < shape[1] and 0 <= position[2] < shape[2] and 0 <= position[3] < shape[3]
 
 
 def add_coordinates(a: Coordinate, b: Coordinate) -> Coordinate:
-    return tuple(x + y for x, y in zip(a, b))  # type: ignore[return-value]
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2], a[3] + b[3])
+
+
+def ray_length(position: Coordinate, direction: Coordinate, shape: Coordinate) -> int:
+    # Number of whole steps along ``direction`` that stay on the board
+    length: Optional[int] = None
+    for coord, step, dim in zip(position, direction, shape):
+        if step > 0:
+            room = (dim - 1 - coord) // step
+        elif step < 0:
+            room = coord // -step
+        else:
+            continue
+        if length is None or room < length:
+            length = room
+    return max(length or 0, 0)
 
 
 def scale_coordinate(vector: Coordinate, scalar: int) -> Coordinate:
-    return tuple(component * scalar for component in vector)  # type: ignore[return-value]
+    return (vector[0] * scalar, vector[1] * scalar, vector[2] * scalar, vector[3] * scalar)
 
 
-def king_offsets(dimensions: int = 4) -> List[Coordinate]:
+@functools.lru_cache(maxsize=None)
+def king_offsets(dimensions: int = 4) -> Tuple[Coordinate, ...]:
     offsets: List[Coordinate] = []
     ranges = [-1, 0, 1]
     for x in ranges:
@@ -67,10 +129,14 @@ def king_offsets(dimensions: int = 4) -> List[Coordinate]:
                         continue
                     if (x, y, z, w) != (0, 0, 0, 0):
                         offsets.append((x, y, z, w))
-    return offsets
+    return tuple(offsets)
+
 
+_KING_OFFSETS = king_offsets()
 
-def rook_directions(dimensions: int = 4) -> List[Coordinate]:
+
+@functools.lru_cache(maxsize=None)
+def rook_directions(dimensions: int = 4) -> Tuple[Coordinate, ...]:
     directions: List[Coordinate] = []
     basis = [0] * dimensions
     for axis in range(dimensions):
@@ -80,10 +146,11 @@ def rook_directions(dimensions: int = 4) -> List[Coordinate]:
         vec = basis.copy()
         vec[axis] = -1
         directions.append(tuple(vec))
-    return directions
+    return tuple(directions)
 
 
-def bishop_directions(dimensions: int = 4) -> List[Coordinate]:
+@functools.lru_cache(maxsize=None)
+def bishop_directions(dimensions: int = 4) -> Tuple[Coordinate, ...]:
     directions: List[Coordinate] = []
     values = [-1, 0, 1]
     for x in values:
@@ -96,10 +163,16 @@ def bishop_directions(dimensions: int = 4) -> List[Coordinate]:
                     non_zero = [component for component in vec if component != 0]
                     if len(non_zero) >= 2 and len(set(abs(component) for component in non_zero)) == 1:
                         directions.append(vec)
-    return directions
+    return tuple(directions)
+
+
+@functools.lru_cache(maxsize=None)
+def queen_directions(dimensions: int = 4) -> Tuple[Coordinate, ...]:
+    return rook_directions(dimensions) + bishop_directions(dimensions)
 
 
-def knight_offsets(dimensions: int = 4) -> List[Coordinate]:
+@functools.lru_cache(maxsize=None)
+def knight_offsets(dimensions: int = 4) -> Tuple[Coordinate, ...]:
     offsets: set[Coordinate] = set()
     base = [0] * dimensions
     axes = list(range(dimensions))
@@ -113,7 +186,7 @@ def knight_offsets(dimensions: int = 4) -> List[Coordinate]:
                     vec[i] = 2 * sign_i
                     vec[j] = 1 * sign_j
                     offsets.add(tuple(vec))
-    return sorted(offsets)
+    return tuple(sorted(offsets))
 
 
 def coordinate_to_string(coordinate: Coordinate) -> str:
@@ -125,12 +198,17 @@ __all__ = [
     "MovementProfile",
     "MovementRules",
     "Move",
+    "EMPTY_METADATA",
+    "CAPTURE_METADATA",
+    "NON_CAPTURE_METADATA",
     "within_bounds",
     "add_coordinates",
+    "ray_length",
     "scale_coordinate",
     "king_offsets",
     "rook_directions",
     "bishop_directions",
+    "queen_directions",
     "knight_offsets",
     "coordinate_to_string",
 ]
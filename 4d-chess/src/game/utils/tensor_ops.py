@@ -1,6 +1,8 @@
 """Lightweight tensor manipulation utilities for 4D chess."""
 from __future__ import annotations
 
+import itertools
+import math
 from typing import Iterable, Iterator, List, Sequence, Tuple, Any
 
 
@@ -23,13 +25,7 @@ def create_tensor(shape: Sequence[int], fill: Any = None) -> List:
 
 
 def iterate_indices(shape: Sequence[int]) -> Iterator[Tuple[int, ...]]:
-    if not shape:
-        yield ()
-        return
-    first, *rest = shape
-    for idx in range(first):
-        for sub in iterate_indices(rest):
-            yield (idx, *sub)
+    return itertools.product(*(range(dim) for dim in shape))
 
 
 def get_value(tensor: Sequence, index: Sequence[int]) -> Any:
@@ -49,71 +45,125 @@ def set_value(tensor: Sequence, index: Sequence[int], value: Any) -> None:
 def flatten(tensor: Sequence) -> List[Any]:
     if not isinstance(tensor, list):
         return [tensor]
-    result: List[Any] = []
-    for item in tensor:
-        result.extend(flatten(item))
-    return result
+    # Splice one nesting level per pass instead of recursing per element
+    flat: List[Any] = list(tensor)
+    while any(isinstance(item, list) for item in flat):
+        spliced: List[Any] = []
+        for item in flat:
+            if isinstance(item, list):
+                spliced.extend(item)
+            else:
+                spliced.append(item)
+        flat = spliced
+    return flat
 
 
 def reshape(flat_data: Iterable[Any], shape: Sequence[int]) -> List:
-    iterator = iter(flat_data)
-
-    def _build(current_shape: Sequence[int]) -> List:
-        if not current_shape:
-            return next(iterator)
-        first, *rest = current_shape
-        return [_build(rest) for _ in range(first)]
-
-    total = 1
-    for dim in shape:
-        total *= dim
-    flat_list = list(flat_data)
+    flat_list = flat_data if isinstance(flat_data, list) else list(flat_data)
+    total = size_of(shape)
     if len(flat_list) != total:
         raise ValueError("Total size mismatch when reshaping tensor")
-    iterator = iter(flat_list)
-    return _build(shape)
+    if not shape:
+        return flat_list[0]
+    if total == 0:
+        return create_tensor(shape)
+    # Fold the flat data into rows from the innermost axis outwards
+    rows: List[Any] = flat_list
+    for dim in reversed(shape[1:]):
+        rows = [rows[start:start + dim] for start in range(0, len(rows), dim)]
+    return list(rows) if rows is flat_data else rows
 
 
 def transpose(tensor: Sequence, axes: Sequence[int]) -> List:
-    original_shape = shape_of(tensor)
-    if sorted(axes) != list(range(len(original_shape))):
-        raise ValueError("Invalid axes permutation for transpose")
-    new_shape = tuple(original_shape[axis] for axis in axes)
-    result = create_tensor(new_shape, None)
-    for index in iterate_indices(original_shape):
-        new_index = tuple(index[axis] for axis in axes)
-        set_value(result, new_index, get_value(tensor, index))
-    return result
+    data, new_shape = transpose_flat(flatten(tensor), shape_of(tensor), axes)
+    return reshape(data, new_shape)
 
 
 def swap_axes(tensor: Sequence, axis_a: int, axis_b: int) -> List:
-    axes = list(range(len(shape_of(tensor))))
-    axes[axis_a], axes[axis_b] = axes[axis_b], axes[axis_a]
-    return transpose(tensor, axes)
+    data, new_shape = swap_axes_flat(flatten(tensor), shape_of(tensor), axis_a, axis_b)
+    return reshape(data, new_shape)
 
 
 def move_axis(tensor: Sequence, source: int, destination: int) -> List:
-    axes = list(range(len(shape_of(tensor))))
-    axis = axes.pop(source)
-    axes.insert(destination, axis)
-    return transpose(tensor, axes)
+    data, new_shape = move_axis_flat(flatten(tensor), shape_of(tensor), source, destination)
+    return reshape(data, new_shape)
 
 
 def reshape_tensor(tensor: Sequence, new_shape: Sequence[int]) -> List:
     return reshape(flatten(tensor), new_shape)
 
 
+def size_of(shape: Sequence[int]) -> int:
+    return math.prod(shape)
+
+
+def strides_of(shape: Sequence[int]) -> Tuple[int, ...]:
+    strides: List[int] = []
+    step = 1
+    for dim in reversed(shape):
+        strides.append(step)
+        step *= dim
+    return tuple(reversed(strides))
+
+
+def create_flat(shape: Sequence[int], fill: Any = None) -> List:
+    return [fill] * size_of(shape)
+
+
+def unravel_index(offset: int, shape: Sequence[int]) -> Tuple[int, ...]:
+    index: List[int] = []
+    for dim in reversed(shape):
+        offset, remainder = divmod(offset, dim)
+        index.append(remainder)
+    return tuple(reversed(index))
+
+
+def transpose_flat(data: Sequence, shape: Sequence[int], axes: Sequence[int]) -> Tuple[List, Tuple[int, ...]]:
+    if sorted(axes) != list(range(len(shape))):
+        raise ValueError("Invalid axes permutation for transpose")
+    strides = strides_of(shape)
+    new_shape = tuple(shape[axis] for axis in axes)
+    # Source offsets of every destination cell, built in row-major order
+    offsets = [0]
+    for axis in axes:
+        stride = strides[axis]
+        offsets = [base + idx * stride for base in offsets for idx in range(shape[axis])]
+    return [data[offset] for offset in offsets], new_shape
+
+
+def swap_axes_flat(data: Sequence, shape: Sequence[int], axis_a: int, axis_b: int) -> Tuple[List, Tuple[int, ...]]:
+    axes = list(range(len(shape)))
+    axes[axis_a], axes[axis_b] = axes[axis_b], axes[axis_a]
+    return transpose_flat(data, shape, axes)
+
+
+def move_axis_flat(data: Sequence, shape: Sequence[int], source: int, destination: int) -> Tuple[List, Tuple[int, ...]]:
+    axes = list(range(len(shape)))
+    axis = axes.pop(source)
+    axes.insert(destination, axis)
+    return transpose_flat(data, shape, axes)
+
+
+def reshape_flat(data: Sequence, new_shape: Sequence[int]) -> Tuple[List, Tuple[int, ...]]:
+    if len(data) != size_of(new_shape):
+        raise ValueError("Total size mismatch when reshaping tensor")
+    return list(data), tuple(new_shape)
+
+
 def roll_axis(tensor: Sequence, axis: int, shift: int) -> List:
     shape = shape_of(tensor)
-    axis_len = shape[axis]
-    shift = shift % axis_len
-    if shift == 0:
-        return [row[:] if isinstance(row, list) else row for row in tensor]
+    return reshape(roll_flat(flatten(tensor), shape, axis, shift), shape)
+
 
-    # Move axis to front, rotate, then move back
-    moved = move_axis(tensor, axis, 0)
-    rotated = moved[shift:] + moved[:shift]
-    return move_axis(rotated, 0, axis)
+def roll_flat(data: Sequence, shape: Sequence[int], axis: int, shift: int) -> List:
+    shift = shift % shape[axis]
+    strides = strides_of(shape)
+    offsets = [0]
+    for index, dim in enumerate(shape):
+        order = range(dim) if index != axis else [(value + shift) % dim for value in range(dim)]
+        stride = strides[index]
+        offsets = [base + value * stride for base in offsets for value in order]
+    return [data[offset] for offset in offsets]
 
 
 __all__ = [
@@ -129,4 +179,13 @@ __all__ = [
     "move_axis",
     "reshape_tensor",
     "roll_axis",
+    "size_of",
+    "strides_of",
+    "create_flat",
+    "unravel_index",
+    "transpose_flat",
+    "swap_axes_flat",
+    "move_axis_flat",
+    "reshape_flat",
+    "roll_flat",
 ]
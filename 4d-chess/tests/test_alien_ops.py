@@ -1,6 +1,7 @@
 from game.board import Board
 from game.pieces.alien import Alien
 from game.pieces.standard_pieces import Pawn
+from game.utils import tensor_ops
 
 
 def test_alien_swap_axis_operation():
@@ -23,3 +24,8 @@ def test_alien_reshape_operation_changes_shape():
     board.apply_layout(alien, {"operation": "reshape_axis", "axis_pair": (0, 1), "new_shape": (2, 8, 4, 4)})
     assert board.shape == (2, 8, 4, 4)
     assert board.get_piece((0, 0, 0, 0)) is alien
+
+
+def test_flatten_handles_ragged_nesting():
+    assert tensor_ops.flatten([1, [2, [3, 4]], [], 5]) == [1, 2, 3, 4, 5]
+    assert tensor_ops.flatten(tensor_ops.create_tensor((2, 3, 1, 2), 0)) == [0] * 12
@@ -24,3 +24,43 @@ def test_layout_transpose_keeps_alien_fixed():
     board.apply_layout(alien, {"operation": "transpose", "axes": (1, 0, 2, 3)})
     assert board.get_piece((0, 0, 0, 0)) is alien
     assert board.get_piece((0, 1, 0, 0)) is pawn
+
+
+def test_iter_positions_tracks_identical_pieces_separately():
+    board = Board((3, 3, 3, 3))
+    first = Pawn(0)
+    second = Pawn(0)
+    board.place_piece(first, (0, 0, 0, 0))
+    board.place_piece(second, (0, 1, 0, 0))
+    assert sorted(position for position, _ in board.iter_positions()) == [(0, 0, 0, 0), (0, 1, 0, 0)]
+    assert [entry["position"] for entry in board.to_dict()["pieces"]] == [(0, 0, 0, 0), (0, 1, 0, 0)]
+
+
+def test_owner_bitboards_follow_moves_and_layouts():
+    board = Board((3, 3, 3, 3))
+    alien = Alien(0)
+    pawn = Pawn(1)
+    board.place_piece(alien, (0, 0, 0, 0))
+    board.place_piece(pawn, (1, 0, 0, 0))
+    board.move_piece((0, 0, 0, 0), (1, 0, 0, 0))
+    assert board.owner_bitboard(1) == 0
+    assert board.owner_bitboard(0) == 1 << board._index((1, 0, 0, 0))
+    board.place_piece(Pawn(1), (0, 2, 0, 0))
+    board.apply_layout(alien, {"operation": "swap_axis", "axes": (0, 1)})
+    assert board.owner_bitboard(1) == 1 << board._index((2, 0, 0, 0))
+    assert board.piece_count(0) == 1
+    assert board.piece_count(1) == 1
+
+
+def test_out_of_bounds_positions_are_rejected():
+    board = Board((4, 4, 4, 4))
+    pawn = Pawn(0)
+    board.place_piece(pawn, (0, 0, 0, 0))
+    board.place_piece(Pawn(1), (0, 0, 1, 1))
+    with pytest.raises(ValueError):
+        board.move_piece((0, 0, 0, 0), (0, 0, 0, 5))
+    assert board.positions[pawn] == (0, 0, 0, 0)
+    assert board.piece_count(1) == 1
+    data = {"shape": (4, 4, 4, 4), "pieces": [{"type": "Pawn", "owner": 0, "position": (0, 0, 0, 5)}]}
+    with pytest.raises(ValueError):
+        Board.from_dict(data, lambda piece_data: Pawn(piece_data["owner"]))
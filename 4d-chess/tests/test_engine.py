@@ -1,7 +1,11 @@
+import json
+
+from cli.main import cmd_load
 from game.engine import GameEngine
+from game.pieces.alien import Alien
 from game.pieces.cat import Cat
 from game.pieces.standard_pieces import King, Rook
-from game.rules import MovementRules
+from game.rules import MovementProfile, MovementRules
 
 
 def configure_custom_engine():
@@ -36,6 +40,7 @@ def test_engine_cat_scratch_and_move(tmp_path):
     engine.save(save_path.as_posix())
     loaded = GameEngine.load(save_path.as_posix())
     assert loaded.board.shape == engine.board.shape
+    assert loaded._captured == engine._captured
 
 
 def test_engine_move_piece():
@@ -44,3 +49,57 @@ def test_engine_move_piece():
     engine.board.place_piece(rook, (0, 1, 0, 0))
     result = engine.execute_move(0, (0, 1, 0, 0), (1, 1, 0, 0))
     assert "moved" in result
+
+
+def test_ordinary_moves_exclude_alien_layouts():
+    engine = configure_custom_engine()
+    alien = Alien(0)
+    engine.board.place_piece(alien, (1, 1, 1, 1))
+    moves = engine.legal_ordinary_moves_from((1, 1, 1, 1))
+    assert moves
+    assert all(move.move_type != "layout" for move in moves)
+    assert any(move.move_type == "layout" for move in engine.legal_moves_from((1, 1, 1, 1)))
+
+
+def test_layout_with_directly_placed_alien():
+    engine = configure_custom_engine()
+    engine.board.place_piece(Alien(0), (1, 1, 1, 1))
+    assert engine.perform_layout(0, {"operation": "swap_axis", "axes": (0, 1)}) == "Alien performed swap_axis"
+
+
+def test_layout_after_cli_load(tmp_path):
+    path = tmp_path / "game.json"
+    GameEngine().save(str(path))
+    engine = GameEngine()
+    cmd_load(engine, str(path))
+    assert engine.perform_layout(0, {"operation": "swap_axis", "axes": (0, 1)}) == "Alien performed swap_axis"
+
+
+def test_load_reads_legacy_captured_format(tmp_path):
+    engine = GameEngine()
+    path = tmp_path / "legacy.json"
+    engine.save(str(path))
+    data = json.loads(path.read_text())
+    data["captured"] = {"0": ["Pawn"], "1": []}
+    path.write_text(json.dumps(data))
+    loaded = GameEngine.load(str(path))
+    assert loaded._captured == {0: ["Pawn"], 1: []}
+
+
+def test_list_shapes_are_accepted():
+    engine = GameEngine([4, 4, 4, 4])
+    assert engine.legal_moves_for_player(0)
+    rules = MovementRules([4, 4, 4, 4], {0: MovementProfile(axis=0, direction=1, home_coordinates=[1])})
+    assert hash(rules.board_shape) and hash(rules.pawn_directions[0])
+
+
+def test_replace_state_adopts_loaded_game(tmp_path):
+    source = configure_custom_engine()
+    source._captured[0].append("Pawn")
+    path = tmp_path / "game.json"
+    source.save(str(path))
+    engine = GameEngine()
+    engine.replace_state(GameEngine.load(str(path)))
+    assert engine.board_snapshot() == source.board_snapshot()
+    assert engine._captured == source._captured
+    assert engine._king_positions == source._king_positions
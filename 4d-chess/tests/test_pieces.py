@@ -1,4 +1,5 @@
 from game.board import Board
+from game.pieces.alien import LAYOUT_TARGET, Alien
 from game.pieces.cat import Cat
 from game.pieces.standard_pieces import Knight, Pawn, Rook
 from game.rules import MovementProfile, MovementRules
@@ -45,3 +46,35 @@ def test_cat_generates_scratch_move():
     scratch_moves = [move for move in moves if move.move_type == "scratch"]
     assert scratch_moves
     assert scratch_moves[0].end == (2, 0, 1, 1)
+
+
+def test_alien_moves_to_square_skip_layouts():
+    board = prepare_board()
+    alien = Alien(0)
+    board.place_piece(alien, (1, 1, 1, 1))
+    step_moves = alien.get_moves_to(board, (1, 1, 1, 1), RULES, (2, 2, 1, 1))
+    assert [move.move_type for move in step_moves] == ["move"]
+    layout_moves = alien.get_moves_to(board, (1, 1, 1, 1), RULES, LAYOUT_TARGET)
+    assert layout_moves and all(move.move_type == "layout" for move in layout_moves)
+
+
+def test_moves_follow_board_changes():
+    board = prepare_board()
+    rook = Rook(0)
+    board.place_piece(rook, (1, 1, 1, 1))
+    assert len(rook.get_moves(board, (1, 1, 1, 1), RULES)) == 12
+    board.place_piece(Rook(0), (2, 1, 1, 1))
+    assert len(rook.get_moves(board, (1, 1, 1, 1), RULES)) == 10
+    board.remove_piece((2, 1, 1, 1))
+    rook.mark_scratched()
+    assert [move.end for move in rook.get_moves(board, (1, 1, 1, 1), RULES)] == [(2, 1, 1, 1), (3, 1, 1, 1)]
+
+
+def test_pawn_double_step_from_any_home_rank():
+    rules = MovementRules(BOARD_SHAPE, {0: MovementProfile(axis=0, direction=1, home_coordinates=(0, 1))})
+    for home in (0, 1):
+        board = prepare_board()
+        pawn = Pawn(0)
+        board.place_piece(pawn, (home, 1, 1, 1))
+        ends = {move.end for move in pawn.get_moves(board, (home, 1, 1, 1), rules)}
+        assert (home + 2, 1, 1, 1) in ends